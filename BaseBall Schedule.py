@@ -1,6 +1,8 @@
 import os
-import requests
+import requests_cache
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 #Test
 # Create directory structure
@@ -10,6 +12,19 @@ os.makedirs("data/processed", exist_ok=True)
 # Example: MLB Stats API endpoint
 MLB_API_BASE = "https://statsapi.mlb.com/api/v1"
 
+# Reusable HTTP session (keep-alive + retries). The 2024 window below is
+# fully played, so responses are cached on disk for 30 days.
+SESSION = requests_cache.CachedSession(
+    "data/.http_cache",
+    backend="sqlite",
+    expire_after=30 * 86400,
+)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+))
+
 def get_schedule(start_date, end_date):
     """Fetch MLB schedule between dates"""
     url = f"{MLB_API_BASE}/schedule"
@@ -18,21 +33,19 @@ def get_schedule(start_date, end_date):
         "startDate": start_date,
         "endDate": end_date
     }
-    response = requests.get(url, params=params)
+    response = SESSION.get(url, params=params)
     data = response.json()
-    games = []
-
-    for date_info in data.get("dates", []):
-        for game in date_info["games"]:
-            games.append({
-                "gamePk": game["gamePk"],
-                "date": game["gameDate"],
-                "home": game["teams"]["home"]["team"]["name"],
-                "away": game["teams"]["away"]["team"]["name"],
-                "status": game["status"]["abstractGameState"]
-            })
+    games = [g for d in data.get("dates", []) for g in d["games"]]
 
-    return pd.DataFrame(games)
+    return pd.json_normalize(games, sep="_").reindex(columns=[
+        "gamePk", "gameDate", "teams_home_team_name",
+        "teams_away_team_name", "status_abstractGameState"
+    ]).rename(columns={
+        "gameDate": "date",
+        "teams_home_team_name": "home",
+        "teams_away_team_name": "away",
+        "status_abstractGameState": "status"
+    })
 
 # Example usage
 if __name__ == "__main__":
@@ -2,16 +2,22 @@
 collect_betting_odds.py
 
 Fetches MLB betting odds (moneyline and spreads) from The Odds API.
-Saves as a dated CSV in data/raw/odds/.
+Saves as a dated, gzip-compressed CSV in data/raw/odds/.
 """
 
 import os
 import sys
+import csv
+import gzip
 import logging
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
+from raw_io import RAW_FORMAT, write_table
+
 # ─── Configuration ─────────────────────────────────────────────────────────────
 API_KEY    = os.getenv("ODDS_API_KEY")
 SPORT_KEY  = "baseball_mlb"
@@ -19,8 +25,21 @@ REGIONS    = "us"                   # US bookmakers
 MARKETS    = "h2h,spreads"          # head-to-head (moneyline) and spread
 DATE_FMT   = "%Y-%m-%dT%H:%M:%SZ"
 OUTPUT_DIR = "data/raw/odds"
+GZIP_LEVEL = 3                      # CPU vs. ratio trade-off for odds CSVs
+ODDS_COLUMNS = [
+    "match_time", "home_team", "away_team",
+    "site", "market", "outcome", "odds"
+]
 # ────────────────────────────────────────────────────────────────────────────────
 
+# Keep-alive session with retries for The Odds API
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+))
+
 def setup_logging():
     logging.basicConfig(
         level=logging.INFO,
@@ -28,29 +47,73 @@ def setup_logging():
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
-def fetch_odds() -> pd.DataFrame:
+def odds_url() -> str:
     """
-    Calls The Odds API and returns a flattened DataFrame of odds.
+    Builds the Odds API request URL; exits if ODDS_API_KEY is missing.
     """
     if not API_KEY:
         logging.error("Environment variable ODDS_API_KEY not set.")
         sys.exit(1)
 
-    url = (
+    return (
         f"https://api.the-odds-api.com/v4/sports/{SPORT_KEY}"
         f"/odds?apiKey={API_KEY}&regions={REGIONS}"
         f"&markets={MARKETS}&dateFormat=iso"
     )
 
+def request_odds() -> list:
+    """
+    Calls The Odds API and returns the raw list of games.
+    """
     try:
-        resp = requests.get(url)
+        resp = SESSION.get(odds_url())
         resp.raise_for_status()
         data = resp.json()
     except requests.RequestException as e:
         logging.error(f"API request failed: {e}")
         sys.exit(1)
+    return data
 
-    records = []
+def normalize_odds(data: list) -> pd.DataFrame:
+    """
+    Flattens a raw Odds API response into a DataFrame of odds.
+    """
+    # json_normalize requires every game to carry the full record path
+    games = [g for g in data if g.get("bookmakers")]
+    if not games:
+        return pd.DataFrame(columns=ODDS_COLUMNS)
+
+    # Flatten game → bookmaker → market → outcome in one pass
+    df = pd.json_normalize(
+        games,
+        record_path=["bookmakers", "markets", "outcomes"],
+        meta=[
+            "commence_time", "home_team", "away_team",
+            ["bookmakers", "title"],
+            ["bookmakers", "markets", "key"],
+        ],
+    )
+    df = df.rename(columns={
+        "commence_time":          "match_time",
+        "bookmakers.title":       "site",
+        "bookmakers.markets.key": "market",
+        "name":                   "outcome",
+        "price":                  "odds",
+    })[ODDS_COLUMNS]
+
+    # match_time stays an ISO-8601 string; readers parse it on load
+    return df
+
+def fetch_odds() -> pd.DataFrame:
+    """
+    Calls The Odds API and returns a flattened DataFrame of odds.
+    """
+    return normalize_odds(request_odds())
+
+def iter_odds_rows(data: list):
+    """
+    Yields one flat odds record per game/bookmaker/market/outcome.
+    """
     for game in data:
         match_time = game.get("commence_time")
         home = game["home_team"]
@@ -61,7 +124,7 @@ def fetch_odds() -> pd.DataFrame:
             for market in site.get("markets", []):
                 mkt = market["key"]
                 for out in market["outcomes"]:
-                    records.append({
+                    yield {
                         "match_time": match_time,
                         "home_team": home,
                         "away_team": away,
@@ -69,31 +132,53 @@ def fetch_odds() -> pd.DataFrame:
                         "market": mkt,
                         "outcome": out["name"],
                         "odds": out["price"]
-                    })
-
-    df = pd.DataFrame(records)
-    # normalize datetime
-    df["match_time"] = pd.to_datetime(df["match_time"])
-    return df
+                    }
 
-def save_odds(df: pd.DataFrame):
+def odds_path() -> str:
     """
-    Saves DataFrame to CSV named odds_YYYYMMDD.csv in OUTPUT_DIR.
+    Returns today's odds_YYYYMMDD.csv path in OUTPUT_DIR, creating the directory.
     """
     date_str = datetime.utcnow().strftime("%Y%m%d")
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    path = os.path.join(OUTPUT_DIR, f"odds_{date_str}.csv")
-    df.to_csv(path, index=False)
+    return os.path.join(OUTPUT_DIR, f"odds_{date_str}.csv")
+
+def stream_odds_csv(data: list) -> None:
+    """
+    Writes odds rows straight to today's odds_YYYYMMDD.csv.gz while walking
+    the JSON, without building an intermediate records list or DataFrame.
+    """
+    path = odds_path() + ".gz"
+    n_rows = 0
+    with gzip.open(path, "wt", compresslevel=GZIP_LEVEL, newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=ODDS_COLUMNS)
+        writer.writeheader()
+        for row in iter_odds_rows(data):
+            writer.writerow(row)
+            n_rows += 1
+    logging.info(f"Saved {n_rows} odds rows to {path}")
+
+def save_odds(df: pd.DataFrame):
+    """
+    Saves DataFrame as odds_YYYYMMDD.csv (or .parquet) in OUTPUT_DIR.
+    """
+    path = write_table(df, odds_path())
     logging.info(f"Saved {len(df)} odds rows to {path}")
 
+def save_raw_odds(data: list) -> None:
+    """
+    Saves a raw Odds API response: streamed for CSV, via pandas otherwise.
+    """
+    if not any(g.get("bookmakers") for g in data):
+        logging.warning("No odds data returned.")
+    elif RAW_FORMAT == "csv":
+        stream_odds_csv(data)
+    else:
+        save_odds(normalize_odds(data))
+
 def main():
     setup_logging()
     logging.info("Fetching MLB betting odds…")
-    df = fetch_odds()
-    if df.empty:
-        logging.warning("No odds data returned.")
-    else:
-        save_odds(df)
+    save_raw_odds(request_odds())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+collect_daily_data.py
+
+Fetches the current-season MLB schedule (StatsAPI) and today's betting odds
+(The Odds API) concurrently in one asyncio event loop, then saves both
+exactly as collect_schedule_with_scores.py and collect_betting_odds.py do.
+The two sources are independent: if one request fails it is logged and the
+other payload is still saved (the script then exits non-zero).
+"""
+
+import sys
+import asyncio
+import logging
+
+import aiohttp
+
+import collect_betting_odds as odds
+import collect_schedule_with_scores as schedule
+
+# ─── Configuration ─────────────────────────────────────────────────────────────
+MAX_CONNECTIONS = 20
+# ────────────────────────────────────────────────────────────────────────────────
+
+async def fetch(session: aiohttp.ClientSession, url: str, params: dict = None):
+    """
+    GETs `url` and returns the decoded JSON body.
+    """
+    async with session.get(url, params=params) as resp:
+        resp.raise_for_status()
+        return await resp.json()
+
+async def fetch_odds(session: aiohttp.ClientSession):
+    """
+    GETs today's odds; raises instead of exiting when ODDS_API_KEY is unset.
+    """
+    if not odds.API_KEY:
+        raise RuntimeError("Environment variable ODDS_API_KEY not set.")
+    return await fetch(session, odds.odds_url())
+
+async def fetch_all(start_date: str, end_date: str) -> tuple:
+    """
+    Issues the schedule and odds requests together and returns both
+    payloads; a request that failed yields its exception in its place.
+    """
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return tuple(await asyncio.gather(
+            fetch(session, schedule.SCHEDULE_URL,
+                  schedule.schedule_params(start_date, end_date)),
+            fetch_odds(session),
+            return_exceptions=True,
+        ))
+
+def main():
+    odds.setup_logging()
+    existing = schedule.load_existing()
+    start, end = schedule.fetch_window(existing)
+    logging.info(f"Fetching schedule ({start} → {end}) and odds concurrently…")
+
+    sched_data, odds_data = asyncio.run(fetch_all(start, end))
+    failed = False
+
+    if isinstance(sched_data, Exception):
+        logging.error(f"Schedule request failed: {sched_data}")
+        failed = True
+    else:
+        df = schedule.merge_schedule(existing, schedule.parse_schedule(sched_data))
+        path = schedule.save_schedule(df)
+        logging.info(f"Wrote schedule with scores to {path}")
+
+    if isinstance(odds_data, Exception):
+        logging.error(f"Odds API request failed: {odds_data}")
+        failed = True
+    else:
+        odds.save_raw_odds(odds_data)
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,23 @@
 scripts/collect_multi_season_stats.py
 
 Collects team and player statistics from multiple seasons (2015–current).
-Completely clears the entire multi_season directory each run to avoid duplicates.
+Historical seasons already on disk are skipped; pass --rebuild to clear the
+entire multi_season directory and refetch everything.
+All (season × stat type) fetches run concurrently on a thread pool.
+With RAW_FORMAT=parquet each stat type becomes one Parquet dataset
+partitioned by Season (e.g. team_stats/team_batting/Season=2020/).
 """
 
 import os
 import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import pandas as pd
 from datetime import datetime
-from pybaseball import team_batting, team_pitching, batting_stats, pitching_stats
+from pybaseball import cache, team_batting, team_pitching, batting_stats, pitching_stats
+
+from raw_io import RAW_FORMAT, partition_path, write_partition, write_table
 
 # ─── Configuration ─────────────────────────────────────────────────────────────
 START_YEAR = 2015
@@ -17,35 +26,82 @@ END_YEAR   = datetime.now().year - 1  # up through last completed season
 DATA_DIR   = "data/raw/multi_season"
 TEAM_DIR   = os.path.join(DATA_DIR, "team_stats")
 PLAYER_DIR = os.path.join(DATA_DIR, "player_stats")
+MAX_WORKERS = 16                      # fetches are network-bound
+# ────────────────────────────────────────────────────────────────────────────────
+
+# Serve repeated/overlapping requests from pybaseball's disk cache
+cache.enable()
+
+
+def season_target(out_dir: str, name: str, season: int) -> str:
+    """
+    Where one season of stat table `name` is stored: a per-season CSV, or the
+    Season partition of the `name` Parquet dataset.
+    """
+    if RAW_FORMAT == "parquet":
+        return partition_path(os.path.join(out_dir, name), "Season", season)
+    return os.path.join(out_dir, f"{name}_{season}.csv")
+
+
+def fetch_and_save(season: int, fetch, out_dir: str, name: str) -> int:
+    """
+    Fetch one stat table for `season`, tag it with Season and store it.
+    Returns the number of rows written.
+    """
+    df = fetch(season)
+    df["Season"] = season
+    if RAW_FORMAT == "parquet":
+        write_partition(df, os.path.join(out_dir, name), "Season")
+    else:
+        write_table(df, season_target(out_dir, name, season))
+    return len(df)
 
-# Completely remove the multi_season directory to ensure no duplicates
-if os.path.exists(DATA_DIR):
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument(
+    "--rebuild", action="store_true",
+    help="delete the multi_season directory and refetch every season"
+)
+args = parser.parse_args()
+
+# Only wipe previous output when explicitly asked to
+if args.rebuild and os.path.exists(DATA_DIR):
     shutil.rmtree(DATA_DIR)
 
-# Recreate clean multi-season directories
 os.makedirs(TEAM_DIR, exist_ok=True)
 os.makedirs(PLAYER_DIR, exist_ok=True)
 
-# Loop through each season and save stats files
-for season in range(START_YEAR, END_YEAR + 1):
-    # Team batting
-    tb = team_batting(season)
-    tb["Season"] = season
-    tb.to_csv(os.path.join(TEAM_DIR, f"team_batting_{season}.csv"), index=False)
-
-    # Team pitching
-    tp = team_pitching(season)
-    tp["Season"] = season
-    tp.to_csv(os.path.join(TEAM_DIR, f"team_pitching_{season}.csv"), index=False)
-
-    # Player batting (qualified)
-    bat = batting_stats(season, qual=100)
-    bat["Season"] = season
-    bat.to_csv(os.path.join(PLAYER_DIR, f"player_batting_{season}.csv"), index=False)
-
-    # Player pitching (qualified)
-    pit = pitching_stats(season, qual=50)
-    pit["Season"] = season
-    pit.to_csv(os.path.join(PLAYER_DIR, f"player_pitching_{season}.csv"), index=False)
-
-    print(f"[INFO] Saved multi-season stats for {season}")
\ No newline at end of file
+# One task per (season, stat type)
+tasks = [
+    (season, fetch, out_dir, name)
+    for season in range(START_YEAR, END_YEAR + 1)
+    for fetch, out_dir, name in [
+        (team_batting,                     TEAM_DIR,   "team_batting"),
+        (team_pitching,                    TEAM_DIR,   "team_pitching"),
+        (partial(batting_stats, qual=100), PLAYER_DIR, "player_batting"),
+        (partial(pitching_stats, qual=50), PLAYER_DIR, "player_pitching"),
+    ]
+]
+
+# Older seasons are final; keep whatever is already on disk
+tasks = [
+    (season, fetch, out_dir, name)
+    for season, fetch, out_dir, name in tasks
+    if not (os.path.exists(season_target(out_dir, name, season)) and season < END_YEAR)
+]
+
+print(f"[INFO] {len(tasks)} stat tables to fetch")
+
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    futures = {
+        executor.submit(fetch_and_save, season, fetch, out_dir, name):
+            season_target(out_dir, name, season)
+        for season, fetch, out_dir, name in tasks
+    }
+    for future in as_completed(futures):
+        path = futures[future]
+        try:
+            rows = future.result()
+            print(f"[INFO] Saved {rows} rows to {path}")
+        except Exception as e:
+            print(f"[ERROR] Failed to build {path}: {e}")
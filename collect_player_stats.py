@@ -7,11 +7,14 @@ Saves as CSVs in data/raw/player_stats/.
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pandas as pd
 from pybaseball import batting_stats, pitching_stats
 
+from raw_io import write_table
+
 # ─── Configuration ─────────────────────────────────────────────────────────────
 OUTPUT_DIR = "data/raw/player_stats"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -58,31 +61,35 @@ def get_player_pitching_stats(season: int, qual: int = DEFAULT_PIT_QUAL) -> pd.D
 
 def save_stats(df: pd.DataFrame, stat: str, season: int) -> None:
     """
-    Saves `df` to a CSV named player_{stat}_{season}.csv under OUTPUT_DIR.
+    Saves `df` as player_{stat}_{season}.csv (or .parquet) under OUTPUT_DIR.
     """
     filename = f"player_{stat}_{season}.csv"
-    path = os.path.join(OUTPUT_DIR, filename)
-    df.to_csv(path, index=False)
+    path = write_table(df, os.path.join(OUTPUT_DIR, filename))
     logging.info(f"Saved player {stat} stats to {path}")
 
+def fetch_and_save(stat: str, fetch, season: int) -> None:
+    """
+    Runs one fetcher for `season` and saves the result; errors are logged, not raised.
+    """
+    try:
+        df = fetch(season)
+        save_stats(df, stat, season)
+    except Exception as e:
+        logging.error(f"Failed to fetch {stat} stats: {e}")
+
 def main():
     # Set up logging
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     logging.info(f"Collecting player stats for season {SEASON}")
 
-    # Batting stats
-    try:
-        bat_df = get_player_batting_stats(SEASON)
-        save_stats(bat_df, "batting", SEASON)
-    except Exception as e:
-        logging.error(f"Failed to fetch batting stats: {e}")
-
-    # Pitching stats
-    try:
-        pit_df = get_player_pitching_stats(SEASON)
-        save_stats(pit_df, "pitching", SEASON)
-    except Exception as e:
-        logging.error(f"Failed to fetch pitching stats: {e}")
+    # Batting and pitching are independent requests; fetch them concurrently
+    fetchers = {
+        "batting":  get_player_batting_stats,
+        "pitching": get_player_pitching_stats,
+    }
+    with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+        for stat, fetch in fetchers.items():
+            executor.submit(fetch_and_save, stat, fetch, SEASON)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
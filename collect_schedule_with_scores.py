@@ -3,13 +3,23 @@ scripts/collect_schedule_with_scores.py
 
 Fetches the MLB schedule for the CURRENT season (including final boxscores) and
 saves to data/raw/mlb_schedule_{season}.csv.
+
+If that file already exists, only the window from the last Final game to the
+end of the season is refetched and merged in; pass --rebuild to pull the
+whole season again.
 """
 
 import os
-import requests
+import argparse
+import functools
+import requests_cache
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 
+from raw_io import output_path, read_table, write_table
+
 # ─── Configuration ─────────────────────────────────────────────────────────────
 OUTPUT_DIR = "data/raw"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -17,47 +27,163 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 # Use current year for schedule
 SEASON = datetime.now().year
 MLB_API_BASE = "https://statsapi.mlb.com/api/v1"
+SCHEDULE_URL = f"{MLB_API_BASE}/schedule"
+
+# Flattened StatsAPI field → output column
+SCHEDULE_COLUMNS = {
+    "gamePk":                   "gamePk",
+    "gameDate":                 "date",
+    "teams_home_team_name":     "home_team",
+    "teams_away_team_name":     "away_team",
+    "status_abstractGameState": "status",
+    "teams_home_score":         "home_score",
+    "teams_away_score":         "away_score",
+}
+
+# On-disk HTTP cache (SQLite). The season window still contains live games,
+# so schedule responses only stay fresh for an hour.
+HTTP_CACHE = "data/.http_cache"
+SCHEDULE_CACHE_TTL = 3600             # seconds
 # ────────────────────────────────────────────────────────────────────────────────
 
-def get_schedule_with_scores(start_date: str, end_date: str) -> pd.DataFrame:
+# Shared session: reuse TCP/TLS connections across calls, retry transient
+# errors and serve repeat requests from the local cache
+SESSION = requests_cache.CachedSession(
+    HTTP_CACHE,
+    backend="sqlite",
+    cache_control=True,
+    expire_after=SCHEDULE_CACHE_TTL,
+)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+))
+
+@functools.lru_cache(maxsize=512)
+def cached_json(url: str, params: tuple) -> dict:
     """
-    Pulls schedule between start_date and end_date, including final scores.
+    GETs `url` with `params` (a sorted tuple of items) and returns the decoded
+    JSON. Identical calls within one process are answered from memory; callers
+    must treat the result as read-only.
+    """
+    resp = SESSION.get(url, params=dict(params))
+    resp.raise_for_status()
+    return resp.json()
+
+def schedule_params(start_date: str, end_date: str) -> dict:
+    """
+    Query parameters for the schedule endpoint, hydrated with scores.
     """
-    url = f"{MLB_API_BASE}/schedule"
-    params = {
+    return {
         "sportId": 1,
         "startDate": start_date,
         "endDate": end_date,
         "hydrate": "teams,linescore"
     }
-    resp = requests.get(url, params=params)
-    resp.raise_for_status()
-    data = resp.json()
-
-    rows = []
-    for date_info in data.get("dates", []):
-        for game in date_info["games"]:
-            home = game["teams"]["home"]
-            away = game["teams"]["away"]
-            rows.append({
-                "gamePk":     game["gamePk"],
-                "date":       game["gameDate"],
-                "home_team":  home["team"]["name"],
-                "away_team":  away["team"]["name"],
-                "status":     game["status"]["abstractGameState"],
-                "home_score": home.get("score"),
-                "away_score": away.get("score")
-            })
-    return pd.DataFrame(rows)
+
+def parse_schedule(data: dict) -> pd.DataFrame:
+    """
+    Flattens a StatsAPI schedule response into one row per game.
+    """
+    games = [g for d in data.get("dates", []) for g in d["games"]]
+    # reindex: score columns are absent until at least one game has started
+    return (
+        pd.json_normalize(games, sep="_")
+        .reindex(columns=list(SCHEDULE_COLUMNS))
+        .rename(columns=SCHEDULE_COLUMNS)
+    )
+
+def get_schedule_with_scores(start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Pulls schedule between start_date and end_date, including final scores.
+    """
+    params = schedule_params(start_date, end_date)
+    data = cached_json(SCHEDULE_URL, tuple(sorted(params.items())))
+    return parse_schedule(data)
+
+def season_window() -> tuple:
+    """
+    (start, end) dates covering the whole SEASON, spring training included.
+    """
+    return f"{SEASON}-03-01", f"{SEASON}-11-01"
+
+def schedule_path() -> str:
+    """
+    Target path of the season schedule (before any format suffix swap).
+    """
+    return f"{OUTPUT_DIR}/mlb_schedule_{SEASON}.csv"
+
+def load_existing():
+    """
+    Returns the previously saved season schedule, or None if there is none.
+    """
+    if not os.path.exists(output_path(schedule_path())):
+        return None
+    return read_table(schedule_path())
+
+def fetch_window(existing) -> tuple:
+    """
+    (start, end) dates still worth fetching. Days before the last Final game
+    can no longer change, so only the rest of the season is requested.
+    """
+    start, end = season_window()
+    if existing is None or existing.empty:
+        return start, end
+
+    final = existing.loc[existing["status"] == "Final", "date"]
+    if final.empty:
+        return start, end
+
+    # Back up a day: the API filters on local dates but gameDate is UTC
+    last_final = pd.to_datetime(final, utc=True).max() - pd.Timedelta(days=1)
+    return max(start, last_final.strftime("%Y-%m-%d")), end
+
+def merge_schedule(existing, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Overlays freshly fetched games on the saved schedule. Saved rows inside
+    the refetched window (dated at or after its first game, or matching a
+    fetched row on gamePk and date) are replaced by `new` as-is; rows before
+    it are kept unchanged. gamePk alone is not a key: postponed and suspended
+    games are listed on both their original and their makeup date.
+    """
+    if existing is None:
+        return new
+    if new.empty:
+        return existing
+
+    window_start = pd.to_datetime(new["date"], utc=True).min()
+    refetched = pd.to_datetime(existing["date"], utc=True) >= window_start
+    keys = pd.MultiIndex.from_frame(new[["gamePk", "date"]])
+    refetched |= pd.MultiIndex.from_frame(existing[["gamePk", "date"]]).isin(keys)
+
+    return (
+        pd.concat([existing[~refetched], new], ignore_index=True)
+        .sort_values(["date", "gamePk"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+def save_schedule(df: pd.DataFrame) -> str:
+    """
+    Writes the season schedule under OUTPUT_DIR and returns the path.
+    """
+    return write_table(df, schedule_path())
 
 
 def main():
-    # Define season window
-    start = f"{SEASON}-03-01"
-    end   = f"{SEASON}-11-01"
-    df    = get_schedule_with_scores(start, end)
-    filepath = f"{OUTPUT_DIR}/mlb_schedule_{SEASON}.csv"
-    df.to_csv(filepath, index=False)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="ignore the saved schedule and refetch the whole season"
+    )
+    args = parser.parse_args()
+
+    existing = None if args.rebuild else load_existing()
+    start, end = fetch_window(existing)
+    print(f"[INFO] Fetching schedule {start} → {end}")
+
+    df = merge_schedule(existing, get_schedule_with_scores(start, end))
+    filepath = save_schedule(df)
     print(f"[SUCCESS] Wrote schedule with scores to {filepath}")
 
 
@@ -12,6 +12,8 @@ from datetime import datetime
 import pandas as pd
 from pybaseball import team_batting, team_pitching
 
+from raw_io import write_table
+
 # ─── Configuration ─────────────────────────────────────────────────────────────
 OUTPUT_DIR = "data/raw/team_stats"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -42,10 +44,9 @@ def get_team_pitching_stats(season: int) -> pd.DataFrame:
 
 def save_stats(df: pd.DataFrame, stat: str, season: int) -> None:
     """
-    Saves `df` to a CSV named team_{stat}_{season}.csv under OUTPUT_DIR.
+    Saves `df` as team_{stat}_{season}.csv (or .parquet) under OUTPUT_DIR.
     """
-    path = os.path.join(OUTPUT_DIR, f"team_{stat}_{season}.csv")
-    df.to_csv(path, index=False)
+    path = write_table(df, os.path.join(OUTPUT_DIR, f"team_{stat}_{season}.csv"))
     logging.info(f"Saved {stat} stats to {path}")
 
 def main():
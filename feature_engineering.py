@@ -1,12 +1,12 @@
 """
 scripts/feature_engineering.py
 
-1) Reads schedule, odds, and team_stats from baseball_analytics.db
-2) Normalizes team names for a clean join
-3) Aggregates moneyline odds into per-game features
-4) Computes last-season win_pct for each team
-5) Flags home favorites
-6) Outputs game_features to CSV and SQLite table
+Runs a single SQL query against baseball_analytics.db that:
+1) Normalizes schedule team names for a clean join
+2) Aggregates moneyline odds into per-game features
+3) Computes last-season win_pct for each team
+4) Flags home favorites
+then outputs game_features to CSV and SQLite table.
 """
 
 import os
@@ -14,6 +14,8 @@ import logging
 import pandas as pd
 from sqlalchemy import create_engine
 
+from raw_io import write_csv
+
 # ─── CONFIG ────────────────────────────────────────────────────────────────────
 BASE_DIR   = os.path.dirname(__file__)
 DATA_DIR   = os.path.join(BASE_DIR, "data")
@@ -22,6 +24,8 @@ ODDS_TABLE = "odds"
 SCHEDULE   = "schedule"
 TEAM_STATS = "team_stats"
 PROCESSED  = os.path.join(DATA_DIR, "processed")
+SQLITE_MAX_PARAMS = 32766       # bound variables per statement (SQLite ≥ 3.32)
+INSERT_CHUNK      = 1000        # rows per multi-row INSERT, at most
 os.makedirs(PROCESSED, exist_ok=True)
 # ────────────────────────────────────────────────────────────────────────────────
 
@@ -39,11 +43,65 @@ def setup_logging():
     )
 
 
-def amer_to_imp_prob(odds: float) -> float:
-    """American odds → implied probability."""
-    if odds > 0:
-        return 100 / (odds + 100)
-    return -odds / (-odds + 100)
+def build_features_sql() -> str:
+    """
+    Returns one SQLite statement that normalizes team names, aggregates the
+    moneyline odds per game, joins them to the schedule and attaches each
+    team's previous-season win_pct. Games and odds are matched on an integer
+    UTC day number (epoch seconds // 86400) rather than a date string.
+    Expects TEAM_NAME_MAP as (?, ?) params.
+    """
+    team_map_rows = ", ".join(["(?, ?)"] * len(TEAM_NAME_MAP))
+    return f"""
+    WITH team_map(mlb_name, odds_name) AS (VALUES {team_map_rows}),
+    sched AS (
+        SELECT s.gamePk, s.date,
+               COALESCE(hm.odds_name, s.home_team)             AS home_team,
+               COALESCE(am.odds_name, s.away_team)             AS away_team,
+               CAST(strftime('%Y', s.date) AS INTEGER)         AS Season,
+               CAST(strftime('%s', s.date) AS INTEGER) / 86400 AS match_day
+        FROM {SCHEDULE} s
+        LEFT JOIN team_map hm ON hm.mlb_name = s.home_team
+        LEFT JOIN team_map am ON am.mlb_name = s.away_team
+    ),
+    ml AS (
+        -- American odds → implied probability
+        SELECT home_team, away_team, outcome, odds,
+               CAST(strftime('%s', match_time) AS INTEGER) / 86400 AS match_day,
+               CASE WHEN odds > 0 THEN 100.0 / (odds + 100.0)
+                    ELSE -odds / (-odds + 100.0) END AS imp_prob
+        FROM {ODDS_TABLE}
+        WHERE market = 'h2h'
+    ),
+    agg AS (
+        SELECT home_team, away_team, match_day,
+               AVG(CASE WHEN outcome = home_team THEN odds END)     AS home_odds_avg,
+               AVG(CASE WHEN outcome = away_team THEN odds END)     AS away_odds_avg,
+               AVG(CASE WHEN outcome = home_team THEN imp_prob END) AS home_imp_avg,
+               AVG(CASE WHEN outcome = away_team THEN imp_prob END) AS away_imp_avg
+        FROM ml
+        GROUP BY home_team, away_team, match_day
+    ),
+    win_pct AS (
+        -- only pitching rows carry W/L; one row per team-season
+        SELECT Team, Season, 1.0 * W / (W + L) AS win_pct
+        FROM {TEAM_STATS}
+        WHERE W IS NOT NULL AND L IS NOT NULL
+    )
+    SELECT s.gamePk, s.Season, s.date, s.home_team, s.away_team,
+           a.home_odds_avg, a.away_odds_avg,
+           a.home_imp_avg, a.away_imp_avg,
+           hw.win_pct AS home_win_pct, aw.win_pct AS away_win_pct,
+           COALESCE(a.home_imp_avg > a.away_imp_avg, 0) AS home_favorite
+    FROM sched s
+    JOIN agg a
+      ON a.home_team  = s.home_team
+     AND a.away_team  = s.away_team
+     AND a.match_day  = s.match_day
+    LEFT JOIN win_pct hw ON hw.Team = s.home_team AND hw.Season = s.Season - 1
+    LEFT JOIN win_pct aw ON aw.Team = s.away_team AND aw.Season = s.Season - 1
+    ORDER BY s.date, s.gamePk
+    """
 
 
 def main():
@@ -52,90 +110,27 @@ def main():
 
     engine = create_engine(f"sqlite:///{DB_PATH}")
 
-    # Load raw tables
-    df_sched = pd.read_sql_table(SCHEDULE, engine, parse_dates=["date"])
-    df_odds  = pd.read_sql_table(ODDS_TABLE, engine, parse_dates=["match_time"])
-    df_ts    = pd.read_sql_table(TEAM_STATS, engine)
-
-    # 1) Rename to match odds schema
-    df_sched = df_sched.rename(columns={"home": "home_team", "away": "away_team"})
-
-    # 2) Normalize team names
-    df_sched["home_team"] = df_sched["home_team"].replace(TEAM_NAME_MAP)
-    df_sched["away_team"] = df_sched["away_team"].replace(TEAM_NAME_MAP)
-
-    # 3) Extract date-only and seasons
-    df_sched["match_date"] = df_sched["date"].dt.date
-    df_sched["Season"]     = df_sched["date"].dt.year
-    df_sched["Prev_Season"] = df_sched["Season"] - 1
-    df_odds["match_date"]  = df_odds["match_time"].dt.date
-
-    # 4) Moneyline odds & implied prob
-    df_ml = df_odds[df_odds["market"] == "h2h"].copy()
-    df_ml["imp_prob"] = df_ml["odds"].apply(amer_to_imp_prob)
-
-    # 5) Aggregate per game
-    def agg_odds(group):
-        home, away = group.name[0], group.name[1]
-        return pd.Series({
-            "home_odds_avg": group.loc[group["outcome"] == home, "odds"].mean(),
-            "away_odds_avg": group.loc[group["outcome"] == away, "odds"].mean(),
-            "home_imp_avg" : group.loc[group["outcome"] == home, "imp_prob"].mean(),
-            "away_imp_avg" : group.loc[group["outcome"] == away, "imp_prob"].mean(),
-        })
-
-    agg = (
-        df_ml
-        .groupby(["home_team", "away_team", "match_date"])
-        .apply(agg_odds)
-        .reset_index()
-    )
-
-    # 6) Merge schedule + odds
-    df = pd.merge(
-        df_sched,
-        agg,
-        how="inner",
-        on=["home_team", "away_team", "match_date"]
-    )
-
-    # 7) Last-season win_pct
-    ts = df_ts.copy()
-    ts["win_pct"] = ts["W"] / (ts["W"] + ts["L"])
-    # rename Season column in team_stats to Prev_Season for join
-    ts = ts.rename(columns={"Season": "Prev_Season", "Team": "team_name"})
-    home_wp = ts[["team_name", "Prev_Season", "win_pct"]].rename(
-        columns={"team_name": "home_team", "win_pct": "home_win_pct"}
+    # Normalize, aggregate and join inside SQLite; only the final
+    #      per-game rows come back to pandas
+    params = tuple(v for pair in TEAM_NAME_MAP.items() for v in pair)
+    # win_pct is all NULL when no previous season matches; keep it numeric
+    df_final = pd.read_sql_query(
+        build_features_sql(), engine, params=params, parse_dates=["date"],
+        dtype={"home_win_pct": "float64", "away_win_pct": "float64"}
     )
-    away_wp = ts[["team_name", "Prev_Season", "win_pct"]].rename(
-        columns={"team_name": "away_team", "win_pct": "away_win_pct"}
-    )
-
-    df = df.merge(home_wp, how="left", on=["home_team", "Prev_Season"])
-    df = df.merge(away_wp, how="left", on=["away_team", "Prev_Season"])
+    df_final["home_favorite"] = df_final["home_favorite"].astype(bool)
 
-    # drop Prev_Season helper
-    df = df.drop(columns=["Prev_Season"])
-
-    # 8) Flag home favorite
-    df["home_favorite"] = df["home_imp_avg"] > df["away_imp_avg"]
-
-    # 9) Final columns
-    cols = [
-        "gamePk","Season","date","home_team","away_team",
-        "home_odds_avg","away_odds_avg",
-        "home_imp_avg","away_imp_avg",
-        "home_win_pct","away_win_pct",
-        "home_favorite"
-    ]
-    df_final = df[cols]
-
-    # 10) Save outputs
+    # Save outputs
     csv_path = os.path.join(PROCESSED, "game_features.csv")
-    df_final.to_csv(csv_path, index=False)
+    write_csv(df_final, csv_path)
     logging.info(f"Saved features CSV to {csv_path}")
 
-    df_final.to_sql("game_features", engine, if_exists="replace", index=False)
+    # Multi-row INSERTs, sized to stay under SQLite's bound-parameter limit
+    chunksize = max(1, min(INSERT_CHUNK, SQLITE_MAX_PARAMS // len(df_final.columns)))
+    df_final.to_sql(
+        "game_features", engine, if_exists="replace", index=False,
+        method="multi", chunksize=chunksize
+    )
     logging.info("Written 'game_features' table to database.")
 
 if __name__ == "__main__":
@@ -1,31 +1,42 @@
 """
 scripts/load_data_to_db.py
 
-Reads the latest schedule CSV (current season) plus team and player stats
-and loads them into a master SQLite DB at data/baseball_analytics.db.
+Reads the schedule CSV for a season (--year, default current) plus the
+previous season's team and player stats and loads them into a master
+SQLite DB at data/baseball_analytics.db.
+
+CSVs are scanned lazily with Polars (multi-threaded native parser), unioned,
+and handed over as Arrow record batches to sqlite3 executemany.
+Each CSV is parsed once into an uncompressed Arrow IPC sibling (.arrow);
+later runs memory-map that instead of re-parsing text until the CSV changes.
+Sources written with RAW_FORMAT=parquet are read from their .parquet
+sibling when the CSV is absent.
+All tables are written in a single transaction with journaling relaxed
+for the duration of the load.
 """
 
-import os
 import sys
 import logging
+import argparse
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # ─── Configuration ─────────────────────────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 DB_PATH  = DATA_DIR / "baseball_analytics.db"
+RAW_DIR  = DATA_DIR / "raw"
 
-# Dynamically pick the schedule CSV for the current year
-current_year = pd.Timestamp.now().year
-SCHEDULE_CSV = DATA_DIR / "raw" / f"mlb_schedule_{current_year}.csv"
-TEAM_BATTING_CSV  = DATA_DIR / "raw" / "team_stats" / f"team_batting_{current_year - 1}.csv"
-TEAM_PITCHING_CSV = DATA_DIR / "raw" / "team_stats" / f"team_pitching_{current_year - 1}.csv"
-PLAYER_BATTING_CSV  = DATA_DIR / "raw" / "player_stats" / f"player_batting_{current_year - 1}.csv"
-PLAYER_PITCHING_CSV = DATA_DIR / "raw" / "player_stats" / f"player_pitching_{current_year - 1}.csv"
+BATCH_ROWS     = 50_000            # rows per executemany call
+MAX_WORKERS    = 5                 # one CSV → IPC conversion per source file
+TIMESTAMP_FMT  = "%Y-%m-%d %H:%M:%S"
 # ────────────────────────────────────────────────────────────────────────────────
 
 def setup_logging():
@@ -41,41 +52,210 @@ def file_check(path: Path):
         sys.exit(1)
 
 
-def get_engine(db_path: Path):
-    return create_engine(f"sqlite:///{db_path}")
+def table_sources(year: int) -> dict:
+    """
+    Table name → source CSVs: `year`'s schedule and the stats of the
+    season before it (batting and pitching are stacked into one table).
+    """
+    stats = year - 1
+    return {
+        "schedule":     [RAW_DIR / f"mlb_schedule_{year}.csv"],
+        "team_stats":   [RAW_DIR / "team_stats" / f"team_batting_{stats}.csv",
+                         RAW_DIR / "team_stats" / f"team_pitching_{stats}.csv"],
+        "player_stats": [RAW_DIR / "player_stats" / f"player_batting_{stats}.csv",
+                         RAW_DIR / "player_stats" / f"player_pitching_{stats}.csv"],
+    }
+
+
+def resolve_source(path: Path) -> Path:
+    """
+    `path`, or its .parquet sibling if only that exists (RAW_FORMAT=parquet).
+    """
+    parquet = path.with_suffix(".parquet")
+    if not path.exists() and parquet.exists():
+        return parquet
+    return path
+
+
+def quote(name: str) -> str:
+    """Quotes an SQLite identifier (column names contain %, /, + and spaces)."""
+    return '"' + name.replace('"', '""') + '"'
+
 
+def sqlite_type(dtype: pa.DataType) -> str:
+    """Arrow type → SQLite column type."""
+    if pa.types.is_integer(dtype) or pa.types.is_boolean(dtype):
+        return "INTEGER"
+    if pa.types.is_floating(dtype) or pa.types.is_null(dtype):
+        return "REAL"
+    if pa.types.is_timestamp(dtype) or pa.types.is_date(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
 
-def ingest_csv_to_sql(table_name: str, df: pd.DataFrame, engine):
+
+def batch_rows(batch: pa.RecordBatch):
+    """
+    Yields the rows of `batch` as tuples ready for executemany. Timestamps
+    are formatted as whole-second text, so schedule.date and odds.match_time
+    share one format whatever unit they were parsed with.
+    """
+    cols = []
+    for col in batch.columns:
+        if pa.types.is_timestamp(col.type):
+            # %S prints the sub-second digits of ms/us/ns timestamps
+            col = col.cast(pa.timestamp("s", col.type.tz), safe=False)
+        if pa.types.is_timestamp(col.type) or pa.types.is_date(col.type):
+            col = pc.strftime(col, format=TIMESTAMP_FMT)
+        cols.append(col.to_pylist())
+    return zip(*cols)
+
+
+@contextmanager
+def bulk_load(conn: sqlite3.Connection):
+    """
+    Runs the enclosed inserts as one transaction with fsync disabled and the
+    rollback journal kept in memory, restoring the previous settings after.
+    """
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    synchronous  = conn.execute("PRAGMA synchronous").fetchone()[0]
+    conn.isolation_level = None      # we issue BEGIN/COMMIT ourselves
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA journal_mode=MEMORY")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("BEGIN")
     try:
-        df.to_sql(table_name, engine, if_exists="replace", index=False)
-        logging.info(f"Ingested {len(df)} rows into '{table_name}'.")
-    except SQLAlchemyError as e:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(f"PRAGMA synchronous={synchronous}")
+
+
+def null_empty_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Retypes columns without a single value as Null. Polars reads them as
+    String, which would otherwise turn the same (numeric) stat column of
+    the other file into TEXT once the files are stacked.
+    """
+    if df.height == 0:
+        return df
+    counts = df.null_count().row(0)
+    empty = [col for col, n in zip(df.columns, counts) if n == df.height]
+    return df.with_columns(pl.col(empty).cast(pl.Null)) if empty else df
+
+
+def csv_to_ipc(path: Path) -> Path:
+    """
+    Returns the Arrow IPC cache for `path`, (re)writing it first if it is
+    missing or older than the CSV. Written uncompressed so reads are a
+    plain memory map.
+    """
+    ipc_path = path.with_suffix(".arrow")
+    if not ipc_path.exists() or ipc_path.stat().st_mtime < path.stat().st_mtime:
+        # infer types from every row: stat columns are often empty for the
+        # first hundred players and only filled further down
+        df = pl.read_csv(path, try_parse_dates=True, infer_schema_length=None)
+        null_empty_columns(df).write_ipc(ipc_path)
+        logging.info(f"Cached {path.name} as {ipc_path.name}")
+    return ipc_path
+
+
+def cache_sources(paths):
+    """
+    Brings the IPC caches of all `paths` up to date concurrently (Polars
+    releases the GIL while parsing). Failures are only logged here; the
+    table that needs the file reports them again when it is ingested.
+    """
+    csvs = [path for path in paths if path.suffix == ".csv"]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(csv_to_ipc, path): path for path in csvs}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (OSError, pl.exceptions.PolarsError) as e:
+                logging.warning(f"Could not cache {futures[future].name}: {e}")
+
+
+def scan_sources(paths) -> pl.LazyFrame:
+    """
+    Lazily scans the sources in `paths` (cached CSVs or Parquet) and stacks
+    them into one contiguous frame. Columns missing from a file are
+    null-filled and columns typed differently across files (e.g. Int64 vs
+    Float64) are cast to their common supertype; batting and pitching have
+    different schemas. Empty columns are cached as Null, so they never
+    widen a numeric column to String.
+    """
+    frames = [
+        pl.scan_parquet(path) if path.suffix == ".parquet"
+        else pl.scan_ipc(csv_to_ipc(path))
+        for path in paths
+    ]
+    return pl.concat(frames, how="diagonal_relaxed", rechunk=True)
+
+
+def ingest_csv_to_sql(table_name: str, paths, conn: sqlite3.Connection):
+    """
+    Replaces `table_name` with the union of the CSVs in `paths`, inserted
+    in batches of BATCH_ROWS. Must run inside bulk_load(); a failure only
+    rolls back this table.
+    """
+    savepoint = quote(f"load_{table_name}")
+    conn.execute(f"SAVEPOINT {savepoint}")
+    try:
+        table = scan_sources(paths).collect(engine="streaming").to_arrow()
+        columns = ", ".join(
+            f"{quote(f.name)} {sqlite_type(f.type)}" for f in table.schema
+        )
+        insert = (
+            f"INSERT INTO {quote(table_name)} "
+            f"VALUES ({', '.join('?' * table.num_columns)})"
+        )
+        conn.execute(f"DROP TABLE IF EXISTS {quote(table_name)}")
+        conn.execute(f"CREATE TABLE {quote(table_name)} ({columns})")
+        for batch in table.to_batches(max_chunksize=BATCH_ROWS):
+            conn.executemany(insert, batch_rows(batch))
+        conn.execute(f"RELEASE {savepoint}")
+        logging.info(f"Ingested {table.num_rows} rows into '{table_name}'.")
+    except (sqlite3.Error, pl.exceptions.PolarsError, pa.ArrowException) as e:
+        conn.execute(f"ROLLBACK TO {savepoint}")
+        conn.execute(f"RELEASE {savepoint}")
         logging.error(f"Failed to ingest {table_name}: {e}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--year", type=int, default=datetime.now().year,
+        help="schedule season to load (stats come from the season before)"
+    )
+    args = parser.parse_args()
+
     setup_logging()
-    logging.info("Starting database ingestion...")
+    logging.info(f"Starting database ingestion for {args.year}...")
+    tables = {
+        table_name: [resolve_source(path) for path in paths]
+        for table_name, paths in table_sources(args.year).items()
+    }
+    sources = [path for paths in tables.values() for path in paths]
 
     # Check files
-    for path in [SCHEDULE_CSV, TEAM_BATTING_CSV, TEAM_PITCHING_CSV, PLAYER_BATTING_CSV, PLAYER_PITCHING_CSV]:
+    for path in sources:
         file_check(path)
 
-    engine = get_engine(DB_PATH)
-    logging.info("Reading CSV files...")
-
-    df_schedule = pd.read_csv(SCHEDULE_CSV, parse_dates=["date"])
-    df_team_bat = pd.read_csv(TEAM_BATTING_CSV)
-    df_team_pit = pd.read_csv(TEAM_PITCHING_CSV)
-    df_player_bat = pd.read_csv(PLAYER_BATTING_CSV)
-    df_player_pit = pd.read_csv(PLAYER_PITCHING_CSV)
+    # Parse all CSVs up front, in parallel, outside the write transaction
+    # (Parquet sources are already columnar and are scanned directly)
+    cache_sources(sources)
 
-    df_team = pd.concat([df_team_bat, df_team_pit], ignore_index=True, sort=False)
-    df_player = pd.concat([df_player_bat, df_player_pit], ignore_index=True, sort=False)
+    conn = sqlite3.connect(DB_PATH)
+    logging.info("Scanning CSV files into the database...")
 
-    ingest_csv_to_sql("schedule", df_schedule, engine)
-    ingest_csv_to_sql("team_stats", df_team, engine)
-    ingest_csv_to_sql("player_stats", df_player, engine)
+    with bulk_load(conn):
+        for table_name, paths in tables.items():
+            ingest_csv_to_sql(table_name, paths, conn)
+    conn.close()
 
     logging.info(f"Database saved at {DB_PATH}")
     logging.info("Ingestion complete.")
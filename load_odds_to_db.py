@@ -5,20 +5,29 @@ Reads the latest odds CSV(s) from data/raw/odds/ and loads them into
 the 'odds' table in your SQLite database at data/baseball_analytics.db.
 
 If the table exists, it replaces it so you always have the freshest odds.
+Files are streamed in Arrow record batches inside a single transaction,
+so memory stays flat however many files are loaded. Odds saved with
+RAW_FORMAT=parquet (odds_*.parquet) are picked up as well.
 """
 
-import os
 import logging
+import sqlite3
 from pathlib import Path
-import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from load_data_to_db import batch_rows, bulk_load, quote, sqlite_type
 
 # ─── Configuration ─────────────────────────────────────────────────────────────
 BASE_DIR    = Path(__file__).resolve().parent
 DATA_DIR    = BASE_DIR / "data"
 DB_PATH     = DATA_DIR / "baseball_analytics.db"
 ODDS_DIR    = DATA_DIR / "raw" / "odds"
+# Pinned so every file yields the same types, whatever its first block holds
+ODDS_TYPES = {"match_time": pa.timestamp("s", "UTC"), "odds": pa.float64()}
+ODDS_CONVERT_OPTIONS = pv.ConvertOptions(column_types=ODDS_TYPES)
 # ────────────────────────────────────────────────────────────────────────────────
 
 def setup_logging():
@@ -30,18 +39,62 @@ def setup_logging():
 
 def find_latest_odds_files(odds_dir: Path):
     """
-    Returns a list of all odds CSV files in odds_dir, sorted by name.
+    Returns a list of all odds files (.csv, .csv.gz or .parquet) in odds_dir,
+    sorted by name.
+    """
+    return sorted([
+        *odds_dir.glob("odds_*.csv"),
+        *odds_dir.glob("odds_*.csv.gz"),
+        *odds_dir.glob("odds_*.parquet"),
+    ])
+
+def parquet_batches(path: Path, schema: pa.Schema):
+    """
+    Yields the row groups of a Parquet odds file cast to `schema`
+    (match_time is stored there as an ISO-8601 string).
     """
-    return sorted(odds_dir.glob("odds_*.csv"))
+    with pq.ParquetFile(path) as pf:
+        for batch in pf.iter_batches():
+            yield batch.cast(schema)
 
-def ingest_odds(df: pd.DataFrame, engine):
+def open_odds(path: Path) -> pa.RecordBatchReader:
     """
-    Writes the odds DataFrame to the 'odds' table in the database.
+    Streams an odds file as Arrow batches. CSVs may be gzipped (detected
+    from the suffix); Parquet files are cast to the same column types.
+    """
+    if path.suffix == ".parquet":
+        schema = pq.read_schema(path)
+        schema = pa.schema([
+            pa.field(f.name, ODDS_TYPES.get(f.name, f.type)) for f in schema
+        ])
+        return pa.RecordBatchReader.from_batches(schema, parquet_batches(path, schema))
+    return pv.open_csv(path, convert_options=ODDS_CONVERT_OPTIONS)
+
+def ingest_odds(paths, conn: sqlite3.Connection):
+    """
+    Replaces the 'odds' table with the rows of the odds files in `paths`,
+    inserted batch by batch. Must run inside bulk_load(). Only one file is
+    open at a time; the table schema comes from the first.
     """
     try:
-        df.to_sql("odds", engine, if_exists="replace", index=False)
-        logging.info(f"Ingested {len(df)} rows into 'odds' table.")
-    except SQLAlchemyError as e:
+        with open_odds(paths[0]) as reader:
+            schema = reader.schema
+        columns = ", ".join(f"{quote(f.name)} {sqlite_type(f.type)}" for f in schema)
+        conn.execute("DROP TABLE IF EXISTS odds")
+        conn.execute(f"CREATE TABLE odds ({columns})")
+        n_rows = 0
+        for path in paths:
+            with open_odds(path) as reader:
+                names = reader.schema.names
+                insert = (
+                    f"INSERT INTO odds ({', '.join(quote(c) for c in names)}) "
+                    f"VALUES ({', '.join('?' * len(names))})"
+                )
+                for batch in reader:
+                    conn.executemany(insert, batch_rows(batch))
+                    n_rows += batch.num_rows
+        logging.info(f"Ingested {n_rows} rows into 'odds' table.")
+    except (sqlite3.Error, pa.ArrowException) as e:
         logging.error(f"Failed to ingest odds table: {e}")
         raise
 
@@ -60,16 +113,16 @@ def main():
         logging.warning(f"No odds CSV files found in {ODDS_DIR}.")
         return
 
-    # You could choose to concatenate multiple days; here we'll use only the latest.
+    # You could choose to concatenate multiple days (pass more files);
+    # here we'll use only the latest.
     latest_file = files[-1]
     logging.info(f"Loading odds from {latest_file.name}")
 
-    # Read and ingest
-    df = pd.read_csv(latest_file, parse_dates=["match_time"])
-    engine = create_engine(f"sqlite:///{DB_PATH}")
-
-    ingest_odds(df, engine)
+    conn = sqlite3.connect(DB_PATH)
+    with bulk_load(conn):
+        ingest_odds([latest_file], conn)
+    conn.close()
     logging.info("Odds ingestion complete.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
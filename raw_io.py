@@ -0,0 +1,122 @@
+"""
+raw_io.py
+
+Shared writer for the raw data dumps produced by the collect_* scripts.
+CSV stays the default because the loaders read CSV; it is written with
+PyArrow's multi-threaded C++ writer, with booleans, timestamps and quoting
+formatted the way DataFrame.to_csv does (whole-number floats are the one
+difference: "2" instead of "2.0"). Set RAW_FORMAT=parquet to write
+zstd-compressed Parquet next to where the CSV would have gone.
+Multi-season dumps can instead be written as hive-partitioned Parquet datasets.
+"""
+
+import os
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+
+# ─── Configuration ─────────────────────────────────────────────────────────────
+RAW_FORMAT = os.getenv("RAW_FORMAT", "csv").lower()   # "csv" or "parquet"
+CSV_WRITE_OPTIONS  = pv.WriteOptions(
+    batch_size=8192, quoting_style="none", quoting_header="none"
+)
+# only for tables with a delimiter/quote/newline inside a value
+CSV_QUOTED_OPTIONS = pv.WriteOptions(batch_size=8192, quoting_style="needed")
+# ────────────────────────────────────────────────────────────────────────────────
+
+
+def to_csv_text(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pre-formats bool and datetime columns as DataFrame.to_csv writes them
+    (True/False, no zero microseconds, "+00:00" offsets); Arrow would write
+    true/false and always append the fraction.
+    """
+    text = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s) or pd.api.types.infer_dtype(s) == "boolean":
+            text[col] = s.map({True: "True", False: "False"})
+        elif pd.api.types.is_datetime64_any_dtype(s):
+            text[col] = s.astype(str).where(s.notna())
+    return df.assign(**text) if text else df
+
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes `df` (without its index) to `path` using PyArrow's CSV writer.
+    Values are only quoted when the table holds one that needs it.
+    """
+    try:
+        table = pa.Table.from_pandas(to_csv_text(df), preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        # mixed-type object columns have no Arrow type; let pandas stringify them
+        logging.warning(f"Writing {path} with pandas, no Arrow type for a column: {e}")
+        df.to_csv(path, index=False)
+        return
+    try:
+        pv.write_csv(table, path, write_options=CSV_WRITE_OPTIONS)
+    except pa.ArrowInvalid:
+        # a value contains a delimiter, quote or newline
+        pv.write_csv(table, path, write_options=CSV_QUOTED_OPTIONS)
+
+
+def output_path(path: str, fmt: str = RAW_FORMAT) -> str:
+    """
+    Maps a `.csv` target path to the file actually written for `fmt`.
+    """
+    if fmt == "parquet":
+        return os.path.splitext(path)[0] + ".parquet"
+    return path
+
+
+def write_table(df: pd.DataFrame, path: str, fmt: str = RAW_FORMAT) -> str:
+    """
+    Writes `df` to `path` (given with a .csv suffix) in the configured format.
+    Returns the path that was written.
+    """
+    out = output_path(path, fmt)
+    if fmt == "parquet":
+        df.to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+    elif fmt == "csv":
+        write_csv(df, out)
+    else:
+        raise ValueError(f"Unknown RAW_FORMAT {fmt!r}; expected 'csv' or 'parquet'")
+    return out
+
+
+def read_table(path: str, fmt: str = RAW_FORMAT) -> pd.DataFrame:
+    """
+    Reads back a table written by write_table for the same `.csv` target path.
+    """
+    out = output_path(path, fmt)
+    if fmt == "parquet":
+        return pd.read_parquet(out)
+    return pd.read_csv(out)
+
+
+def partition_path(base_dir: str, column: str, value) -> str:
+    """
+    Directory holding the `column=value` partition of a dataset at `base_dir`.
+    """
+    return os.path.join(base_dir, f"{column}={value}")
+
+
+def write_partition(df: pd.DataFrame, base_dir: str, column: str = "Season") -> str:
+    """
+    Writes `df` (holding a single `column` value) as one partition of the
+    Parquet dataset at `base_dir`, replacing that partition if it exists.
+    Read back with pd.read_parquet(base_dir, filters=[(column, ">=", ...)]).
+    Returns the partition directory.
+    """
+    table = pa.Table.from_pandas(df.astype({column: "int32"}), preserve_index=False)
+    ds.write_dataset(
+        table,
+        base_dir=base_dir,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(column, pa.int32())]), flavor="hive"),
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        existing_data_behavior="delete_matching",
+    )
+    return partition_path(base_dir, column, df[column].iloc[0])
@@ -3,34 +3,53 @@ scripts/train_baseline_model.py
 
 Trains a baseline logistic regression model for home-team win probability
 using odds-based features only. Drops win_pct features to avoid NaNs.
-Evaluates performance and saves the model and diagnostic plots.
+Evaluates performance and saves the model; diagnostic plots (ROC and
+calibration curves) are only drawn when EMIT_PLOTS is set.
+
+Training data is read through DuckDB's `sqlite` extension, which DuckDB
+downloads on first use. Without it (e.g. offline on a fresh machine) the two
+tables are read with sqlite3 instead and joined in DuckDB all the same.
 """
 
 import os
+import glob
+import hashlib
 import logging
 import joblib
 import sqlite3
+from contextlib import closing
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import duckdb
+import numpy as np
+import polars as pl
 
-from sklearn.model_selection import train_test_split
+from sklearn import config_context
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score,
-    roc_auc_score,
-    brier_score_loss,
-    RocCurveDisplay
-)
-from sklearn.calibration import calibration_curve
 
 # ─── Config ────────────────────────────────────────────────────────────────────
 BASE_DIR  = os.path.dirname(__file__)
 DB_PATH   = os.path.join(BASE_DIR, "data", "baseball_analytics.db")
 MODEL_DIR = os.path.join(BASE_DIR, "models")
+TEST_SIZE = 0.3
+SEED      = 42
+EMIT_PLOTS = bool(os.getenv("EMIT_PLOTS"))   # matplotlib is only imported if set
 os.makedirs(MODEL_DIR, exist_ok=True)
+
+# Outcome is derived inside DuckDB; unplayed games (no score) count as a loss
+FEATURES_SQL = """
+SELECT f.gamePk, f.home_odds_avg, f.away_odds_avg, f.home_imp_avg,
+       f.away_imp_avg, f.home_favorite, f.date,
+       COALESCE(s.home_score > s.away_score, FALSE)::TINYINT AS home_win
+FROM game_features AS f
+LEFT JOIN schedule AS s USING (gamePk)
+"""
+# Cached query result; the name changes with the query, so edits invalidate it
+FRAME_CACHE = os.path.join(
+    MODEL_DIR,
+    f"train_frame_{hashlib.sha1(FEATURES_SQL.encode()).hexdigest()[:12]}.arrow"
+)
 # ────────────────────────────────────────────────────────────────────────────────
 
 def setup_logging():
@@ -41,24 +60,106 @@ def setup_logging():
     )
 
 
-def load_data():
+def attach_tables(con: duckdb.DuckDBPyConnection):
     """
-    Loads odds-based features and outcomes from the database.
+    Makes game_features and schedule queryable on `con`: attaches the SQLite
+    file through DuckDB's sqlite extension, or, if the extension can't be
+    installed, reads both tables with sqlite3 and registers them.
     """
-    conn = sqlite3.connect(DB_PATH)
-    df_feat = pd.read_sql("SELECT gamePk, home_odds_avg, away_odds_avg, home_imp_avg, away_imp_avg, home_favorite, date FROM game_features", conn, parse_dates=["date"])
-    df_sched = pd.read_sql("SELECT gamePk, home_score, away_score FROM schedule", conn)
-    conn.close()
+    try:
+        con.execute("INSTALL sqlite; LOAD sqlite")
+    except duckdb.Error as e:
+        logging.warning(f"DuckDB sqlite extension unavailable, reading tables with sqlite3: {e}")
+        with closing(sqlite3.connect(DB_PATH)) as conn:
+            for name in ("game_features", "schedule"):
+                df = pl.read_database(f"SELECT * FROM {name}", conn, infer_schema_length=None)
+                con.register(name, df)
+        return
+    db_path = DB_PATH.replace("'", "''")
+    con.execute(f"ATTACH '{db_path}' AS db (TYPE sqlite, READ_ONLY)")
+    con.execute("USE db")
 
-    df = df_feat.merge(df_sched, on="gamePk", how="left")
-    df["home_win"] = (df["home_score"] > df["away_score"]).astype(int)
+
+def load_data():
+    """
+    Loads odds-based features and outcomes from the database. DuckDB scans
+    the SQLite tables column-wise, runs the join itself and returns Arrow,
+    which Polars wraps without copying. The result is cached as Arrow IPC
+    and reused until the database file or FEATURES_SQL changes.
+    """
+    if (os.path.exists(FRAME_CACHE)
+            and os.path.getmtime(FRAME_CACHE) > os.path.getmtime(DB_PATH)):
+        logging.info(f"Using cached training frame {FRAME_CACHE}")
+        return pl.read_ipc(FRAME_CACHE)
+
+    with duckdb.connect() as con:
+        attach_tables(con)
+        table = con.execute(FEATURES_SQL).to_arrow_table()
+    df = pl.from_arrow(table)
+    for stale in glob.glob(os.path.join(MODEL_DIR, "train_frame*.arrow")):
+        os.remove(stale)
+    df.write_ipc(FRAME_CACHE)
     return df
 
 
+def evaluate(y_true, y_prob, n_bins=10):
+    """
+    Accuracy, ROC AUC, Brier score and calibration bins of `y_prob` against
+    the 0/1 labels `y_true`, computed together in NumPy. AUC comes from the
+    average ranks of the predictions (ties count half), so a single sort
+    serves it; calibration uses the same uniform bins as sklearn.
+    """
+    y_true = y_true.astype(np.float64)
+    acc   = np.mean((y_prob > 0.5) == y_true)
+    brier = np.mean((y_prob - y_true) ** 2)
+
+    _, inverse, counts = np.unique(y_prob, return_inverse=True, return_counts=True)
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    n_pos = y_true.sum()
+    n_neg = len(y_true) - n_pos
+    if n_pos and n_neg:
+        auc = (ranks @ y_true - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    else:
+        auc = float("nan")                # undefined with a single class
+
+    bins = np.searchsorted(np.linspace(0, 1, n_bins + 1)[1:-1], y_prob)
+    total = np.bincount(bins, minlength=n_bins)
+    seen = total > 0
+    prob_true = np.bincount(bins, weights=y_true, minlength=n_bins)[seen] / total[seen]
+    prob_pred = np.bincount(bins, weights=y_prob, minlength=n_bins)[seen] / total[seen]
+    return acc, auc, brier, (prob_true, prob_pred)
+
+
+def save_plots(y_test, y_prob, calibration):
+    """
+    Saves ROC and calibration curves for the test predictions to MODEL_DIR.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import RocCurveDisplay
+
+    # ROC curve
+    RocCurveDisplay.from_predictions(y_test, y_prob)
+    plt.title("ROC Curve")
+    plt.savefig(os.path.join(MODEL_DIR, "roc_curve.png"))
+    plt.clf()
+
+    # Calibration curve
+    prob_true, prob_pred = calibration
+    plt.plot(prob_pred, prob_true, marker='o', linewidth=1)
+    plt.plot([0,1], [0,1], "k--", linewidth=1)
+    plt.xlabel("Mean Predicted Probability")
+    plt.ylabel("Fraction of Positives")
+    plt.title("Calibration Curve")
+    plt.savefig(os.path.join(MODEL_DIR, "calibration_curve.png"))
+    plt.clf()
+
+
 def train_and_evaluate(df):
     """
     Splits data, trains a logistic regression on odds-only features,
-    evaluates metrics, and saves the model and plots.
+    evaluates metrics, and saves the model (and plots if EMIT_PLOTS).
     """
     features = [
         "home_odds_avg", "away_odds_avg",
@@ -66,54 +167,50 @@ def train_and_evaluate(df):
         "home_favorite"
     ]
 
-    # Drop rows with any missing odds-based feature or target
-    df = df.dropna(subset=features + ["home_win"])
+    # Drop rows with any missing odds-based feature or target and keep only
+    # the model columns as float32 / int8, in one pass over contiguous buffers
+    df = (
+        df.lazy()
+        .drop_nulls(subset=features + ["home_win"])
+        .select(pl.col(features).cast(pl.Float32), pl.col("home_win").cast(pl.Int8))
+        .collect(engine="streaming")
+        .rechunk()
+    )
 
-    X = df[features]
-    y = df["home_win"]
+    X = df.select(features).to_numpy()
+    y = df["home_win"].to_numpy()
 
-    # Random split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y,
-        test_size=0.3,
-        random_state=42
-    )
+    # Random split: one shuffled index, then plain NumPy fancy-indexing
+    idx = np.random.default_rng(SEED).permutation(len(y))
+    n_test = int(TEST_SIZE * len(y))
+    test, train = idx[:n_test], idx[n_test:]
+    X_train, X_test = X[train], X[test]
+    y_train, y_test = y[train], y[test]
 
     pipe = Pipeline([
-        ("scaler", StandardScaler()),
-        ("lr",      LogisticRegression(max_iter=1000, random_state=42))
+        ("scaler", StandardScaler(copy=False)),
+        ("lr",      LogisticRegression(solver="liblinear", random_state=SEED))
     ])
 
     logging.info("Training logistic regression model…")
-    pipe.fit(X_train, y_train)
-
-    # predictions
-    y_pred = pipe.predict(X_test)
+    # SQLite has no NaN, so after drop_nulls every value is finite
+    with config_context(assume_finite=True):
+        pipe.fit(X_train, y_train)
+    # scale in place only while fitting; the saved model must not overwrite
+    # the arrays callers pass to predict / predict_proba
+    pipe.set_params(scaler__copy=True)
+
+    # predictions; one pipeline pass, thresholded below like predict() would
     y_prob = pipe.predict_proba(X_test)[:, 1]
 
-    acc   = accuracy_score(y_test, y_pred)
-    auc   = roc_auc_score(y_test, y_prob)
-    brier = brier_score_loss(y_test, y_prob)
+    acc, auc, brier, calibration = evaluate(y_test, y_prob)
 
     logging.info(f"Test Accuracy : {acc:.3f}")
     logging.info(f"Test ROC AUC  : {auc:.3f}")
     logging.info(f"Test Brier    : {brier:.3f}")
 
-    # ROC curve
-    RocCurveDisplay.from_predictions(y_test, y_prob)
-    plt.title("ROC Curve")
-    plt.savefig(os.path.join(MODEL_DIR, "roc_curve.png"))
-    plt.clf()
-
-    # Calibration curve
-    prob_true, prob_pred = calibration_curve(y_test, y_prob, n_bins=10)
-    plt.plot(prob_pred, prob_true, marker='o', linewidth=1)
-    plt.plot([0,1], [0,1], "k--", linewidth=1)
-    plt.xlabel("Mean Predicted Probability")
-    plt.ylabel("Fraction of Positives")
-    plt.title("Calibration Curve")
-    plt.savefig(os.path.join(MODEL_DIR, "calibration_curve.png"))
-    plt.clf()
+    if EMIT_PLOTS:
+        save_plots(y_test, y_prob, calibration)
 
     # save model
     model_path = os.path.join(MODEL_DIR, "baseline_logreg.joblib")